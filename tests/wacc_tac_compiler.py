@@ -1,7 +1,8 @@
 #!/usr/bin/env python3
 """
 Purpose: Wrapper compiler that adapts the Writing-a-C-Compiler test suite to use the TAC interpreter.
-Inputs: Compiler-style arguments including a single C source file and optional -D defines.
+Inputs: Compiler-style arguments including a single C source file and optional -D defines,
+        or --batch with a manifest listing one such argument list per line.
 Outputs: Creates an executable script for valid programs or returns non-zero on compile failures.
 Invariants/Assumptions: The real compiler is provided via DIOPTASE_BCC and supports -interp.
                       Uses a host gcc-style preprocessor to expand includes/macros first.
@@ -11,12 +12,18 @@ Invariants/Assumptions: The real compiler is provided via DIOPTASE_BCC and suppo
 
 from __future__ import annotations
 
+import concurrent.futures
+import functools
+import hashlib
 import os
 from pathlib import Path
-import stat
+import re
+import shlex
+import shutil
 import subprocess
 import sys
-from typing import List, Optional, Tuple
+import tempfile
+from typing import Iterable, List, Optional, Tuple
 
 
 # Purpose: Define wrapper exit codes for common failure modes.
@@ -32,26 +39,111 @@ EXIT_PREPROCESS_FAILED = 67
 # Invariants/Assumptions: -lm is ignored; -D macros pass through to the real compiler.
 IGNORED_FLAGS = {"-lm"}
 UNSUPPORTED_FLAGS = {"-S", "--lex", "--parse", "--validate", "--tacky", "--codegen"}
+# Purpose: Select batch mode, which compiles many sources listed in a manifest file.
+# Inputs/Outputs: Checked by main before normal argument parsing.
+# Invariants/Assumptions: Each manifest line holds the arguments for one wrapper invocation.
+BATCH_FLAG = "--batch"
 # Purpose: Allow overriding the host preprocessor command for portability.
 # Inputs/Outputs: Read by get_preprocessor_command to pick a gcc-compatible preprocessor.
 # Invariants/Assumptions: The command accepts -E/-P and -D flags.
+#                         Macros must be fully expanded here: -fdirectives-only output keeps
+#                         function-like macros and gcc's builtin #define dump, which the real
+#                         compiler's object-like-only preprocessor rejects.
 PREPROCESSOR_ENV = "DIOPTASE_GCC"
 PREPROCESSOR_FLAGS = ["-E", "-P"]
+# Purpose: Detect sources that the host preprocessor would change beyond stripping comments.
+# Inputs/Outputs: Matched by needs_preprocessing against the raw source bytes.
+# Invariants/Assumptions: Covers directives (including the %: digraph), backslash-newline splices,
+#                         _Pragma, reserved __ identifiers such as gcc's builtin macros, and the
+#                         unix/linux system macros predefined in GNU mode.
+PREPROCESS_TRIGGER_PATTERN = re.compile(
+    rb"#|%:|\\[ \t]*\r?\n|__|_Pragma|\b(?:unix|linux)\b"
+)
+# Purpose: Persist preprocessed sources across runs so unchanged tests skip the host preprocessor.
+# Inputs/Outputs: PREPROCESS_CACHE_ENV overrides the cache directory, or disables the cache when
+#                 set to PREPROCESS_CACHE_DISABLED; otherwise it lives under XDG_CACHE_HOME
+#                 (or ~/.cache) in PREPROCESS_CACHE_SUBDIR.
+# Invariants/Assumptions: Entries are keyed by source path and contents, -D args, and the
+#                         preprocessor executable identity. Sources with quoted includes are
+#                         never cached because local headers are not part of the key.
+#                         System (<...>) headers, CPATH, and C_INCLUDE_PATH are not part of the
+#                         key either, so a libc/header update that leaves the preprocessor binary
+#                         unchanged keeps serving stale entries; clear or disable the cache then.
+#                         Entries are never evicted.
+PREPROCESS_CACHE_ENV = "DIOPTASE_TACC_CACHE_DIR"
+PREPROCESS_CACHE_SUBDIR = "dioptase_tacc"
+PREPROCESS_CACHE_DISABLED = "off"
+PREPROCESS_CACHE_KEY_LENGTH = 32
+LOCAL_INCLUDE_PATTERN = re.compile(rb'^[ \t]*#[ \t]*include[ \t]*"', re.MULTILINE)
 # Purpose: Optionally swap slow runtime tests to host GCC execution.
 # Inputs/Outputs: Controlled by SLOW_RUNTIME_ENV and the SLOW_RUNTIME_TESTS list.
 # Invariants/Assumptions: Used to avoid interpreter timeouts for long-running programs.
+#                         SLOW_RUNTIME_ENV is read once at import; any non-blank value enables it.
 SLOW_RUNTIME_ENV = "DIOPTASE_TACC_GCC_RUNTIME"
-SLOW_RUNTIME_TESTS = {"empty_loop_body.c", "test_for_memory_leaks.c"}
-SLOW_RUNTIME_ENV = "DIOPTASE_TACC_GCC_RUNTIME"
-SLOW_RUNTIME_TESTS = {"empty_loop_body.c", "test_for_memory_leaks.c"}
+SLOW_RUNTIME_TESTS = frozenset(("empty_loop_body.c", "test_for_memory_leaks.c"))
+SLOW_RUNTIME_ENABLED = os.environ.get(SLOW_RUNTIME_ENV, "").strip() != ""
+# Purpose: Hold the run script emitted for each valid test program.
+# Inputs/Outputs: Filled in by write_exec_script with %-formatting of the quoted compiler command.
+# Invariants/Assumptions: Literal '%' characters in the shell text are escaped as '%%'.
+EXEC_SCRIPT_TEMPLATE = """#!/bin/sh
+# Purpose: Execute the TAC interpreter and return its exit status as a process code.
+# Inputs: Uses an embedded compiler command line for the source under test.
+# Outputs: Exits with the interpreted main() result modulo 256; prints diagnostics on failure.
+# Invariants/Assumptions: The compiler prints exactly one integer result on stderr when
+#                         DIOPTASE_TACC_RESULT_STDERR is set.
+EXIT_PARSE_FAILURE=1
+EXIT_CODE_MASK=255
+
+tmp=$(mktemp) || exit "$EXIT_PARSE_FAILURE"
+trap 'rm -f "$tmp"' EXIT
+# dash skips the EXIT trap when a signal kills the shell, so turn signals into exits.
+trap 'exit 129' HUP
+trap 'exit 130' INT
+trap 'exit 143' TERM
+
+DIOPTASE_TACC_RESULT_STDERR=1 %(args_literal)s 2>"$tmp"
+status=$?
+if [ "$status" -ne 0 ]; then
+    cat "$tmp" >&2
+    exit "$status"
+fi
+if [ ! -s "$tmp" ]; then
+    echo "TAC interpreter produced no result" >&2
+    exit "$EXIT_PARSE_FAILURE"
+fi
+# Read the common single-line case with builtins; only longer output needs tail and sed.
+multi_line=
+rest=
+if { IFS= read -r value; IFS= read -r rest || [ -n "$rest" ]; } <"$tmp"; then
+    multi_line=1
+    value=$(tail -n 1 "$tmp")
+fi
+case ${value#[-+]} in
+    ''|*[!0-9]*)
+        printf 'Invalid TAC interpreter output: %%s\\n' "$(cat "$tmp")" >&2
+        exit "$EXIT_PARSE_FAILURE"
+        ;;
+esac
+if [ -n "$multi_line" ]; then
+    sed '$d' "$tmp" >&2
+fi
+exit $((value & EXIT_CODE_MASK))
+"""
+# Purpose: Set the permissions of emitted run scripts (rwxr-xr-x).
+# Inputs/Outputs: Applied with os.fchmod by write_exec_script on the open script descriptor.
+# Invariants/Assumptions: Applied explicitly so a pre-existing, non-executable output file still
+#                         ends up executable regardless of the process umask.
+EXEC_SCRIPT_MODE = 0o755
 
 
+@functools.lru_cache(maxsize=None)
 def get_compiler_path(env_var: str) -> Path:
     """
     Purpose: Resolve the real compiler path from the environment.
     Inputs: env_var names the environment variable to consult.
     Outputs: Returns an absolute Path to the compiler executable.
     Invariants/Assumptions: The environment variable is set and points to an executable file.
+                            Results are cached per process.
     """
     raw = os.environ.get(env_var)
     if raw is None or raw.strip() == "":
@@ -66,6 +158,16 @@ def get_compiler_path(env_var: str) -> Path:
     return path
 
 
+def absolute_path(raw: str) -> Path:
+    """
+    Purpose: Turn a command-line path into an absolute path.
+    Inputs: raw is the path as given, possibly relative or starting with ~.
+    Outputs: Returns an absolute, lexically normalized Path.
+    Invariants/Assumptions: Symlinks are left unresolved to avoid per-component lstat calls.
+    """
+    return Path(os.path.abspath(os.path.expanduser(raw)))
+
+
 def parse_args(argv: List[str]) -> Tuple[Path, Path, List[str], bool]:
     """
     Purpose: Parse wrapper arguments and extract the source and output paths.
@@ -87,7 +189,7 @@ def parse_args(argv: List[str]) -> Tuple[Path, Path, List[str], bool]:
         if arg == "-o":
             if i + 1 >= len(argv):
                 raise ValueError("missing output path after -o")
-            output = Path(argv[i + 1]).expanduser().resolve()
+            output = absolute_path(argv[i + 1])
             i += 2
             continue
         if arg in UNSUPPORTED_FLAGS:
@@ -103,24 +205,26 @@ def parse_args(argv: List[str]) -> Tuple[Path, Path, List[str], bool]:
             raise RuntimeError(f"unsupported compiler option for TAC runner: {arg}")
         if source is not None:
             raise ValueError("multiple source files are not supported by the TAC runner")
-        source = Path(arg).expanduser().resolve()
+        source = absolute_path(arg)
         i += 1
 
     if source is None:
         raise ValueError("no source file provided to TAC compiler wrapper")
 
     if output is None:
-        output = source.with_suffix(".o" if compile_only else "")
+        output = Path(os.path.splitext(source)[0] + (".o" if compile_only else ""))
 
     return source, output, pass_through, compile_only
 
 
+@functools.lru_cache(maxsize=None)
 def get_preprocessor_command(env_var: str) -> str:
     """
     Purpose: Resolve the preprocessor command from the environment.
     Inputs: env_var names the environment variable to consult.
     Outputs: Returns the executable name to invoke.
     Invariants/Assumptions: The command is a single executable name, not a full shell string.
+                            The environment is read once per process.
     """
     raw = os.environ.get(env_var)
     if raw is None or raw.strip() == "":
@@ -134,8 +238,11 @@ def build_preprocessed_path(output: Path) -> Path:
     Inputs: output is the expected executable path for the test case.
     Outputs: Returns a sibling path with a .i suffix appended to the output name.
     Invariants/Assumptions: The test harness cleans up non-source artifacts afterward.
+                            The file must live on disk: the real compiler mmaps its input
+                            (so pipes and /dev/stdin are rejected) and the emitted run script
+                            re-reads it when the test executes.
     """
-    return output.with_name(output.name + ".i")
+    return Path(f"{output}.i")
 
 
 def should_use_gcc_runtime(source: Path) -> bool:
@@ -145,24 +252,211 @@ def should_use_gcc_runtime(source: Path) -> bool:
     Outputs: Returns true when GCC runtime should be used instead of the TAC interpreter.
     Invariants/Assumptions: Activated only when SLOW_RUNTIME_ENV is set.
     """
-    enabled = os.environ.get(SLOW_RUNTIME_ENV)
-    if enabled is None or enabled.strip() == "":
-        return False
-    return source.name in SLOW_RUNTIME_TESTS
+    return SLOW_RUNTIME_ENABLED and source.name in SLOW_RUNTIME_TESTS
+
+
+def run_quiet(args: List[str],
+              capture_stdout: bool = True) -> subprocess.CompletedProcess[bytes]:
+    """
+    Purpose: Run a helper command whose output only matters when it fails.
+    Inputs: args is the command line; args[0] is looked up on PATH when it has no slash;
+            capture_stdout is false for commands whose stdout is never useful.
+    Outputs: Returns a CompletedProcess; raw stdout/stderr bytes are only read back on non-zero exit.
+    Invariants/Assumptions: Uses posix_spawn and spools output to anonymous temp files rather
+                            than pipes, so a chatty child cannot block before it exits.
+    """
+    with tempfile.TemporaryFile() as out_file, tempfile.TemporaryFile() as err_file:
+        if capture_stdout:
+            stdout_action = (os.POSIX_SPAWN_DUP2, out_file.fileno(), 1)
+        else:
+            stdout_action = (os.POSIX_SPAWN_OPEN, 1, os.devnull, os.O_WRONLY, 0)
+        pid = os.posix_spawnp(args[0], args, os.environ, file_actions=[
+            stdout_action,
+            (os.POSIX_SPAWN_DUP2, err_file.fileno(), 2),
+        ])
+        _, wait_status = os.waitpid(pid, 0)
+        returncode = os.waitstatus_to_exitcode(wait_status)
+        if returncode == 0:
+            return subprocess.CompletedProcess(args, returncode, b"", b"")
+        out_file.seek(0)
+        err_file.seek(0)
+        return subprocess.CompletedProcess(args, returncode, out_file.read(), err_file.read())
+
+
+def replay_output(result: subprocess.CompletedProcess[bytes]) -> None:
+    """
+    Purpose: Forward a failed command's captured output to the test harness.
+    Inputs: result holds the raw stdout/stderr bytes from run_quiet.
+    Outputs: None; writes the bytes to this process's stdout and stderr undecoded.
+    Invariants/Assumptions: Text already written through sys.stdout/sys.stderr is flushed first
+                            so ordering is preserved.
+    """
+    sys.stdout.flush()
+    sys.stdout.buffer.write(result.stdout)
+    sys.stdout.buffer.flush()
+    sys.stderr.flush()
+    sys.stderr.buffer.write(result.stderr)
+    sys.stderr.buffer.flush()
 
 
 def preprocess_source(preprocessor: str,
                       source: Path,
                       output: Path,
-                      pass_through: List[str]) -> subprocess.CompletedProcess[str]:
+                      pass_through: List[str]) -> subprocess.CompletedProcess[bytes]:
     """
     Purpose: Run the host preprocessor to expand includes and macros.
     Inputs: preprocessor is the command name; source is the input file; output is the destination.
-    Outputs: Returns the CompletedProcess containing stdout/stderr and exit status.
+    Outputs: Returns the CompletedProcess with exit status, plus raw stderr on failure.
     Invariants/Assumptions: Uses gcc-style -E/-P flags to suppress #line directives.
+                            output is unlinked first so a hard link to a cache entry is never
+                            overwritten in place.
     """
+    remove_path(output)
     args = [preprocessor, *PREPROCESSOR_FLAGS, *pass_through, str(source), "-o", str(output)]
-    return subprocess.run(args, capture_output=True, text=True)
+    return run_quiet(args, capture_stdout=False)
+
+
+def needs_preprocessing(source_text: bytes, pass_through: List[str]) -> bool:
+    """
+    Purpose: Decide whether the host preprocessor has any work to do for a source file.
+    Inputs: source_text is the raw source contents; pass_through holds -D args.
+    Outputs: Returns true when the file may contain directives, macros, or line splices.
+    Invariants/Assumptions: PREPROCESS_TRIGGER_PATTERN conservatively covers everything gcc -E
+                            would change beyond comments, which the real compiler strips itself.
+    """
+    return bool(pass_through) or PREPROCESS_TRIGGER_PATTERN.search(source_text) is not None
+
+
+def write_unpreprocessed(source_text: bytes, destination: Path) -> None:
+    """
+    Purpose: Stand in for preprocessor output by writing the source contents to the destination.
+    Inputs: source_text is the raw source contents; destination is the path to populate.
+    Outputs: None; destination holds a private copy of source_text.
+    Invariants/Assumptions: The destination is unlinked first so it never shares an inode with
+                            the source or a cache entry that a later preprocessor run could truncate.
+    """
+    remove_path(destination)
+    destination.write_bytes(source_text)
+
+
+def link_or_copy(source: Path, destination: Path) -> None:
+    """
+    Purpose: Stand in for preprocessor output by exposing the source at the destination path.
+    Inputs: source is the existing file; destination is the path to populate.
+    Outputs: None; destination refers to the same contents as source.
+    Invariants/Assumptions: Falls back to a copy when hard links are unsupported (e.g. across devices).
+    """
+    remove_path(destination)
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copyfile(source, destination)
+
+
+@functools.lru_cache(maxsize=None)
+def get_preprocessor_identity(preprocessor: str) -> Optional[bytes]:
+    """
+    Purpose: Identify the host preprocessor build for preprocess cache keys.
+    Inputs: preprocessor is the command name.
+    Outputs: Returns the resolved executable path, size, and mtime, or None when it cannot be found.
+    Invariants/Assumptions: Computed once per process from filesystem metadata; no subprocess is
+                            spawned, and reinstalling or upgrading the preprocessor changes it.
+    """
+    executable = shutil.which(preprocessor)
+    if executable is None:
+        return None
+    try:
+        real_path = os.path.realpath(executable)
+        info = os.stat(real_path)
+    except OSError:
+        return None
+    return f"{real_path}\0{info.st_size}\0{info.st_mtime_ns}".encode()
+
+
+def get_preprocess_cache_dir() -> Optional[Path]:
+    """
+    Purpose: Resolve the directory holding cached preprocessed sources.
+    Inputs: None; reads PREPROCESS_CACHE_ENV and XDG_CACHE_HOME from the environment.
+    Outputs: Returns the cache directory path (which may not exist yet), or None when disabled.
+    Invariants/Assumptions: Blank environment values are treated as unset; PREPROCESS_CACHE_DISABLED
+                            is matched case-insensitively.
+    """
+    raw = os.environ.get(PREPROCESS_CACHE_ENV, "").strip()
+    if raw.lower() == PREPROCESS_CACHE_DISABLED:
+        return None
+    if raw != "":
+        return absolute_path(raw)
+    base = os.environ.get("XDG_CACHE_HOME", "").strip()
+    if base == "":
+        base = os.path.join("~", ".cache")
+    return absolute_path(base) / PREPROCESS_CACHE_SUBDIR
+
+
+def get_preprocess_cache_path(preprocessor: str,
+                              source: Path,
+                              source_text: bytes,
+                              pass_through: List[str]) -> Optional[Path]:
+    """
+    Purpose: Compute where the preprocessed form of a source is cached.
+    Inputs: preprocessor is the command name; source/source_text identify the input; pass_through holds -D args.
+    Outputs: Returns the cache entry path, or None when caching is off or the source is uncacheable.
+    Invariants/Assumptions: The entry may not exist yet; callers treat a missing file as a miss.
+    """
+    cache_dir = get_preprocess_cache_dir()
+    if cache_dir is None or LOCAL_INCLUDE_PATTERN.search(source_text):
+        return None
+    identity = get_preprocessor_identity(preprocessor)
+    if identity is None:
+        return None
+    digest = hashlib.blake2b()
+    for part in (str(source).encode(), source_text,
+                 "\0".join([*PREPROCESSOR_FLAGS, *pass_through]).encode(), identity):
+        digest.update(part)
+        digest.update(b"\0")
+    key = digest.hexdigest()[:PREPROCESS_CACHE_KEY_LENGTH]
+    return cache_dir / f"{key}.i"
+
+
+def preprocess_source_cached(preprocessor: str,
+                             source: Path,
+                             source_text: Optional[bytes],
+                             output: Path,
+                             pass_through: List[str]) -> subprocess.CompletedProcess[bytes]:
+    """
+    Purpose: Produce the preprocessed source, reusing a cached copy when one exists.
+    Inputs: preprocessor is the command name; source_text is the source contents or None if unreadable; output is the destination.
+    Outputs: Returns the CompletedProcess of the preprocessor run (synthesized on a cache hit).
+    Invariants/Assumptions: Cache problems fall back to preprocessing straight into output.
+    """
+    cache_path = None
+    if source_text is not None:
+        cache_path = get_preprocess_cache_path(preprocessor, source, source_text, pass_through)
+    if cache_path is None:
+        return preprocess_source(preprocessor, source, output, pass_through)
+
+    try:
+        link_or_copy(cache_path, output)
+        return subprocess.CompletedProcess([preprocessor, str(source)], 0, b"", b"")
+    except OSError:
+        pass
+
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+    except OSError:
+        return preprocess_source(preprocessor, source, output, pass_through)
+    # Preprocess into a private name so concurrent runs never observe a partial entry.
+    staging = Path(f"{cache_path}.{os.getpid()}.tmp")
+    result = preprocess_source(preprocessor, source, staging, pass_through)
+    if result.returncode != 0:
+        remove_path(staging)
+        return result
+    try:
+        os.replace(staging, cache_path)
+        link_or_copy(cache_path, output)
+    except OSError:
+        remove_path(staging)
+        return preprocess_source(preprocessor, source, output, pass_through)
+    return result
 
 
 def remove_path(path: Path) -> None:
@@ -170,84 +464,69 @@ def remove_path(path: Path) -> None:
     Purpose: Remove a file if it exists to keep test output directories clean.
     Inputs: path is the file path to remove.
     Outputs: None; errors are ignored if the file is missing.
-    Invariants/Assumptions: Only files (not directories) are removed.
+    Invariants/Assumptions: Only files (not directories) are removed; unlink is attempted
+                            directly rather than checking the file type first. Linux reports
+                            directories with EISDIR, while macOS/BSD report EPERM. A path whose
+                            parent is not a directory (ENOTDIR) cannot exist and is ignored.
     """
     try:
-        if path.is_file() or path.is_symlink():
-            path.unlink()
-    except FileNotFoundError:
+        os.unlink(path)
+    except (FileNotFoundError, NotADirectoryError, IsADirectoryError):
         pass
+    except PermissionError:
+        if not os.path.isdir(path):
+            raise
+
+
+def remove_paths(paths: Iterable[Path]) -> None:
+    """
+    Purpose: Remove a group of build artifacts after a failed compile.
+    Inputs: paths lists the files to remove.
+    Outputs: None; missing files are ignored as in remove_path and other errors are reported.
+    Invariants/Assumptions: Each path is unlinked independently; one failure does not skip the rest.
+    """
+    for path in paths:
+        try:
+            remove_path(path)
+        except OSError as exc:
+            sys.stderr.write(f"TAC runner failed to remove {path}: {exc}\n")
 
 
 def write_exec_script(output_path: Path,
                       compiler: Path,
-                      pass_through: List[str],
                       input_path: Path) -> None:
     """
     Purpose: Emit an executable script that runs the TAC interpreter for a test case.
-    Inputs: output_path is the executable path; compiler is the real compiler; pass_through holds -D args; input_path is the preprocessed file.
+    Inputs: output_path is the executable path; compiler is the real compiler; input_path is the preprocessed file.
     Outputs: Writes the script to output_path with executable permissions.
-    Invariants/Assumptions: The host can execute Python scripts with /usr/bin/env.
+    Invariants/Assumptions: The host provides a POSIX sh along with mktemp, tail, and sed.
+                            -D defines are not repeated: any source built with them went
+                            through the host preprocessor, which already applied them.
     """
-    args_literal = repr([str(compiler), "-interp", *pass_through, str(input_path)])
-    script = f"""#!/usr/bin/env python3
-import os
-import subprocess
-import sys
-
-EXIT_PARSE_FAILURE = 1
-EXIT_CODE_MASK = 0xFF
-RESULT_ENV = "DIOPTASE_TACC_RESULT_STDERR"
-
-# Purpose: Execute the TAC interpreter and return its exit status as a process code.
-# Inputs: Uses an embedded compiler command line for the source under test.
-# Outputs: Exits with the interpreted main() result modulo 256; prints diagnostics on failure.
-# Invariants/Assumptions: The compiler prints exactly one integer result on stderr when RESULT_ENV is set.
-def main() -> int:
-    args = {args_literal}
-    env = dict(os.environ)
-    env[RESULT_ENV] = "1"
-    result = subprocess.run(args, capture_output=True, text=True, env=env)
-    if result.returncode != 0:
-        sys.stdout.write(result.stdout)
-        sys.stderr.write(result.stderr)
-        return result.returncode
-    stderr_lines = result.stderr.splitlines()
-    if not stderr_lines:
-        sys.stdout.write(result.stdout)
-        sys.stderr.write("TAC interpreter produced no result\\n")
-        return EXIT_PARSE_FAILURE
+    args_literal = f"{shlex.quote(str(compiler))} -interp {shlex.quote(str(input_path))}"
+    script = EXEC_SCRIPT_TEMPLATE % {"args_literal": args_literal}
+    data = script.encode("utf-8")
+    fd = os.open(output_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_CLOEXEC,
+                 EXEC_SCRIPT_MODE)
     try:
-        value = int(stderr_lines[-1].strip())
-    except ValueError:
-        sys.stdout.write(result.stdout)
-        sys.stderr.write(f"Invalid TAC interpreter output: {{result.stderr!r}}\\n")
-        return EXIT_PARSE_FAILURE
-    if len(stderr_lines) > 1:
-        sys.stderr.write("\\n".join(stderr_lines[:-1]) + "\\n")
-    sys.stdout.write(result.stdout)
-    return value & EXIT_CODE_MASK
+        os.fchmod(fd, EXEC_SCRIPT_MODE)
+        written = 0
+        while written < len(data):
+            written += os.write(fd, data[written:])
+    finally:
+        os.close(fd)
 
 
-if __name__ == "__main__":
-    sys.exit(main())
-"""
-    output_path.write_text(script, encoding="utf-8")
-    output_path.chmod(stat.S_IRUSR | stat.S_IWUSR | stat.S_IXUSR |
-                      stat.S_IRGRP | stat.S_IXGRP |
-                      stat.S_IROTH | stat.S_IXOTH)
-
-
-def main(argv: List[str]) -> int:
+def compile_one(args: List[str]) -> int:
     """
-    Purpose: Drive the compiler wrapper by validating arguments and emitting the run script.
-    Inputs: argv is the argument list including the program name.
+    Purpose: Compile a single test source by validating arguments and emitting the run script.
+    Inputs: args is the compiler-style argument list excluding the program name.
     Outputs: Returns a process exit code for the test harness.
     Invariants/Assumptions: The real compiler path is configured via DIOPTASE_BCC.
     """
     try:
         compiler = get_compiler_path("DIOPTASE_BCC")
-        source, output, pass_through, compile_only = parse_args(argv[1:])
+        source, output, pass_through, compile_only = parse_args(args)
     except RuntimeError as exc:
         sys.stderr.write(f"TAC runner error: {exc}\n")
         return EXIT_UNSUPPORTED
@@ -257,70 +536,151 @@ def main(argv: List[str]) -> int:
 
     preprocessor = get_preprocessor_command(PREPROCESSOR_ENV)
     preprocessed = build_preprocessed_path(output)
+    source_text: Optional[bytes]
     try:
-        preprocess_result = preprocess_source(preprocessor, source, preprocessed, pass_through)
-    except FileNotFoundError:
-        sys.stderr.write(
-            f"TAC runner error: preprocessor '{preprocessor}' was not found in PATH\n"
-        )
-        remove_path(preprocessed)
-        return EXIT_PREPROCESS_FAILED
+        source_text = source.read_bytes()
+    except OSError:
+        # Unreadable sources go through the preprocessor so it reports the error.
+        source_text = None
+
+    if source_text is not None and not needs_preprocessing(source_text, pass_through):
+        try:
+            write_unpreprocessed(source_text, preprocessed)
+        except OSError as exc:
+            sys.stderr.write(f"TAC runner failed to write {preprocessed}: {exc}\n")
+            remove_path(preprocessed)
+            return EXIT_WRITE_FAILED
+    else:
+        try:
+            preprocess_result = preprocess_source_cached(
+                preprocessor, source, source_text, preprocessed, pass_through
+            )
+        except FileNotFoundError:
+            sys.stderr.write(
+                f"TAC runner error: preprocessor '{preprocessor}' was not found in PATH\n"
+            )
+            remove_path(preprocessed)
+            return EXIT_PREPROCESS_FAILED
 
-    if preprocess_result.returncode != 0:
-        sys.stdout.write(preprocess_result.stdout)
-        sys.stderr.write(preprocess_result.stderr)
-        remove_path(preprocessed)
-        return preprocess_result.returncode
+        if preprocess_result.returncode != 0:
+            replay_output(preprocess_result)
+            remove_path(preprocessed)
+            return preprocess_result.returncode
 
     # Stop after TAC lowering to avoid invoking the assembler during wrapper compilation.
     compile_args = [str(compiler), *pass_through, "-tac", str(preprocessed)]
-    result = subprocess.run(compile_args, capture_output=True, text=True)
+    result = run_quiet(compile_args)
     if result.returncode != 0:
-        sys.stdout.write(result.stdout)
-        sys.stderr.write(result.stderr)
-        remove_path(output)
-        remove_path(output.with_suffix(".s"))
-        remove_path(preprocessed)
+        replay_output(result)
+        remove_paths((output, Path(os.path.splitext(output)[0] + ".s"), preprocessed))
         return result.returncode
 
     try:
         if compile_only:
             # Use host GCC for object emission since the TAC compiler has no backend.
-            cc_result = subprocess.run(
-                [preprocessor, "-c", str(preprocessed), "-o", str(output)],
-                capture_output=True,
-                text=True,
+            cc_result = run_quiet(
+                [preprocessor, "-c", str(preprocessed), "-o", str(output)], capture_stdout=False
             )
             if cc_result.returncode != 0:
-                sys.stdout.write(cc_result.stdout)
-                sys.stderr.write(cc_result.stderr)
-                remove_path(output)
-                remove_path(preprocessed)
+                replay_output(cc_result)
+                remove_paths((output, preprocessed))
                 return cc_result.returncode
             remove_path(preprocessed)
         elif should_use_gcc_runtime(source):
-            cc_result = subprocess.run(
-                [preprocessor, str(preprocessed), "-o", str(output)],
-                capture_output=True,
-                text=True,
+            cc_result = run_quiet(
+                [preprocessor, str(preprocessed), "-o", str(output)], capture_stdout=False
             )
             if cc_result.returncode != 0:
-                sys.stdout.write(cc_result.stdout)
-                sys.stderr.write(cc_result.stderr)
-                remove_path(output)
-                remove_path(preprocessed)
+                replay_output(cc_result)
+                remove_paths((output, preprocessed))
                 return cc_result.returncode
             remove_path(preprocessed)
         else:
-            write_exec_script(output, compiler, pass_through, preprocessed)
+            write_exec_script(output, compiler, preprocessed)
     except OSError as exc:
         sys.stderr.write(f"TAC runner failed to write executable {output}: {exc}\n")
-        remove_path(output)
-        remove_path(preprocessed)
+        remove_paths((output, preprocessed))
         return EXIT_WRITE_FAILED
 
     return 0
 
 
+def read_batch_manifest(manifest: Path) -> List[List[str]]:
+    """
+    Purpose: Load the per-source argument lists for batch mode.
+    Inputs: manifest is a text file with one shell-quoted argument list per line.
+    Outputs: Returns the parsed argument lists in file order.
+    Invariants/Assumptions: Blank lines and lines starting with '#' are ignored.
+    """
+    entries: List[List[str]] = []
+    for line in manifest.read_text(encoding="utf-8").splitlines():
+        stripped = line.strip()
+        if stripped == "" or stripped.startswith("#"):
+            continue
+        entries.append(shlex.split(stripped))
+    return entries
+
+
+def compile_batch_entry(args: List[str]) -> int:
+    """
+    Purpose: Run compile_one for a batch worker without letting one entry abort the batch.
+    Inputs: args is the argument list for a single manifest entry.
+    Outputs: Returns compile_one's exit code, or EXIT_WRITE_FAILED on an unexpected exception.
+    Invariants/Assumptions: Runs inside a worker process; the exception is reported on stderr.
+    """
+    try:
+        return compile_one(args)
+    except Exception as exc:
+        sys.stderr.write(f"TAC runner error while compiling {shlex.join(args)}: {exc!r}\n")
+        return EXIT_WRITE_FAILED
+
+
+def run_batch(manifest: Path) -> int:
+    """
+    Purpose: Compile every entry of a batch manifest within one wrapper process.
+    Inputs: manifest is the path passed after BATCH_FLAG.
+    Outputs: Returns 0 when every entry succeeds, otherwise the first failing exit code.
+    Invariants/Assumptions: Entries are independent and run in parallel across worker processes;
+                            a failure does not stop later entries.
+    """
+    try:
+        entries = read_batch_manifest(manifest)
+    except (OSError, ValueError) as exc:
+        sys.stderr.write(f"TAC runner usage error: cannot read batch manifest {manifest}: {exc}\n")
+        return EXIT_USAGE
+
+    status = 0
+    with concurrent.futures.ProcessPoolExecutor(max_workers=os.cpu_count()) as pool:
+        futures = [pool.submit(compile_batch_entry, args) for args in entries]
+        for args, future in zip(entries, futures):
+            try:
+                result = future.result()
+            except Exception as exc:
+                # A dead worker (BrokenProcessPool) marks the affected entries failed.
+                sys.stderr.write(f"TAC runner batch worker failed: {exc!r}\n")
+                result = EXIT_WRITE_FAILED
+            if result == 0:
+                continue
+            sys.stderr.write(f"TAC runner batch entry failed ({result}): {shlex.join(args)}\n")
+            if status == 0:
+                status = result
+    return status
+
+
+def main(argv: List[str]) -> int:
+    """
+    Purpose: Drive the compiler wrapper for a single source or a batch manifest.
+    Inputs: argv is the argument list including the program name.
+    Outputs: Returns a process exit code for the test harness.
+    Invariants/Assumptions: BATCH_FLAG must be the only option when present.
+    """
+    if len(argv) > 1 and argv[1] == BATCH_FLAG:
+        if len(argv) != 3:
+            sys.stderr.write(f"TAC runner usage error: {BATCH_FLAG} takes exactly one manifest path\n")
+            return EXIT_USAGE
+        return run_batch(Path(argv[2]))
+    return compile_one(argv[1:])
+
+
 if __name__ == "__main__":
     sys.exit(main(sys.argv))